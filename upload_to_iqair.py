@@ -13,17 +13,26 @@ This script:
 
 from __future__ import annotations
 
+import atexit
+import calendar
 import datetime
-import io
+import functools
 import logging
 import os
+import queue
+import re
 import sqlite3
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from ftplib import FTP, all_errors as FTP_ERRORS
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Set, TextIO, Tuple
 
+import numpy as np
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from appConfig import (
     API_URL,
@@ -43,11 +52,102 @@ logging.basicConfig(
     format="%(asctime)s [%(levelname)s] %(message)s",
 )
 
+# Raw FIDAS columns averaged into each hourly row. They are parsed as
+# float32: the instruments report far fewer significant digits than
+# that holds, and it halves the memory of every raw batch.
+SENSOR_COLUMNS = [
+    "wind speed",
+    "wind direction",
+    "T",
+    "rH",
+    "p",
+    "PM1",
+    "PM2.5",
+    "PM10",
+]
+SENSOR_DTYPES = dict.fromkeys(SENSOR_COLUMNS, "float32")
+
+# Columns of the monthly CSVs and of each upload, in order. The station
+# name and coordinates are the same on every row, so they are kept as
+# one pre-joined field string.
+CSV_COLUMNS = [
+    "datetime",
+    "name",
+    "lat",
+    "lon",
+    "WV",
+    "WD",
+    "TEMP",
+    "HUMI",
+    "PRES",
+    "PM01",
+    "PM25",
+    "PM10",
+]
+CSV_HEADER = ",".join(CSV_COLUMNS) + "\n"
+STATION_FIELDS = "Fidas Station (ACCESS),24.5254,54.4319"
+
+# Raw-file columns the uploader reads; the rest (PM4, PMtot, Cn, flow,
+# Comments, ...) are skipped by the parser. A set lookup rather than a
+# list so a file lacking a column still parses and the missing column
+# is reported where it is first used.
+RAW_COLUMNS = frozenset(["date", "time", *SENSOR_COLUMNS])
+
 
 # ---------------------------------------------------------------------------
 # Database helpers
 # ---------------------------------------------------------------------------
 
+# One long-lived connection per database path, opened lazily by _get_conn().
+# Files are processed from worker threads, so every use of a shared
+# connection goes through _DB_LOCK.
+_CONNECTIONS: Dict[str, sqlite3.Connection] = {}
+_DB_LOCK = threading.RLock()
+
+
+def _get_conn(db_path: str) -> sqlite3.Connection:
+    """Return the shared SQLite connection for *db_path*.
+
+    The connection is opened on first use and kept for the life of the
+    process instead of reconnecting on every status read/write. It runs
+    in autocommit mode (``isolation_level=None``) with WAL journaling
+    and ``synchronous=NORMAL``, so each small status update costs a
+    single WAL append rather than a full rollback-journal fsync.
+    """
+    with _DB_LOCK:
+        connection = _CONNECTIONS.get(db_path)
+        if connection is None:
+            # timeout is SQLite's busy timeout: wait this long for
+            # another process's lock (e.g. someone inspecting the
+            # tracker with the sqlite3 shell) before failing.
+            connection = sqlite3.connect(
+                db_path,
+                timeout=5.0,
+                isolation_level=None,
+                check_same_thread=False,
+                cached_statements=256,
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("PRAGMA temp_store=MEMORY")
+            connection.execute("PRAGMA cache_size=-8000")
+            # The status database is tiny: map it (reads become memcpy)
+            # and keep dirty pages in the cache until commit.
+            connection.execute("PRAGMA mmap_size=268435456")
+            connection.execute("PRAGMA cache_spill=OFF")
+            _CONNECTIONS[db_path] = connection
+            atexit.register(connection.close)
+        return connection
+
+
+# Columns added to processing_status after its original four-column
+# schema. setup_database() adds any that an existing database lacks.
+_STATUS_MIGRATIONS: List[Tuple[str, str]] = [
+    ("last_byte", "INTEGER DEFAULT 0"),
+    ("last_modify", "TEXT"),
+    ("header", "BLOB"),
+]
+
 
 def setup_database(db_path: str) -> None:
     """Create the processing_status table if it does not exist.
@@ -58,50 +158,255 @@ def setup_database(db_path: str) -> None:
     - last_raw_timestamp: latest raw timestamp processed (string).
     - last_avg_timestamp: latest aggregated hourly timestamp sent (string).
     - last_row: number of raw lines already processed.
+    - last_byte: size in bytes of the file when it was last processed.
+    - last_modify: FTP ``MLSD`` modify fact of the file at that time.
+    - header: raw header line of the file, used to resume downloads.
+
+    Databases created with an older schema are migrated in place by
+    adding the missing columns.
     """
-    connection = sqlite3.connect(db_path)
-    try:
-        cursor = connection.cursor()
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS processing_status (
-                filename TEXT PRIMARY KEY,
-                last_raw_timestamp TEXT,
-                last_avg_timestamp TEXT,
-                last_row INTEGER DEFAULT 0
-            )
-            """
+    connection = _get_conn(db_path)
+
+    # auto_vacuum only takes effect on an existing file after a VACUUM;
+    # the status database is a few pages, so this is a one-off blip.
+    (auto_vacuum,) = connection.execute("PRAGMA auto_vacuum").fetchone()
+    if auto_vacuum != 2:  # 2 == INCREMENTAL
+        LOGGER.info("Enabling incremental auto-vacuum on '%s'.", db_path)
+        connection.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        connection.execute("VACUUM")
+
+    connection.execute(
+        """
+        CREATE TABLE IF NOT EXISTS processing_status (
+            filename TEXT PRIMARY KEY,
+            last_raw_timestamp TEXT,
+            last_avg_timestamp TEXT,
+            last_row INTEGER DEFAULT 0,
+            last_byte INTEGER DEFAULT 0,
+            last_modify TEXT,
+            header BLOB
         )
-        connection.commit()
-    finally:
-        connection.close()
+        """
+    )
+
+    existing_columns = {
+        row[1]
+        for row in connection.execute("PRAGMA table_info(processing_status)")
+    }
+    for column, declaration in _STATUS_MIGRATIONS:
+        if column not in existing_columns:
+            LOGGER.info("Adding column '%s' to processing_status.", column)
+            connection.execute(
+                f"ALTER TABLE processing_status ADD COLUMN {column} "
+                f"{declaration}"
+            )
+
+
+# Consecutive checkpoints that could not complete because a reader
+# held the WAL; see maintain_database().
+_checkpoint_busy_streak = 0
+
+
+def maintain_database(db_path: str) -> None:
+    """Checkpoint the WAL and reclaim free pages of *db_path*.
+
+    Meant to be called periodically by the long-running main loop:
+
+    - ``wal_checkpoint(RESTART)`` copies the WAL back into the database
+      and lets the next writer reuse the WAL from the start, so it does
+      not keep growing. After three busy checkpoints in a row the
+      stronger ``TRUNCATE`` mode is used instead.
+    - ``incremental_vacuum`` runs only when the freelist is both at
+      least 1000 pages and at least 10% of the file.
+    """
+    global _checkpoint_busy_streak
+
+    mode = "TRUNCATE" if _checkpoint_busy_streak >= 3 else "RESTART"
+    with _DB_LOCK:
+        connection = _get_conn(db_path)
+        busy, log_pages, checkpointed_pages = connection.execute(
+            f"PRAGMA wal_checkpoint({mode})"
+        ).fetchone()
+        (freelist_count,) = connection.execute(
+            "PRAGMA freelist_count"
+        ).fetchone()
+        (page_count,) = connection.execute("PRAGMA page_count").fetchone()
+
+        if freelist_count > max(1000, page_count * 0.1):
+            LOGGER.info(
+                "Vacuuming '%s' (%d of %d pages free).",
+                db_path,
+                freelist_count,
+                page_count,
+            )
+            connection.execute("PRAGMA incremental_vacuum(1000)")
+
+    LOGGER.info(
+        "WAL checkpoint (%s) on '%s': busy=%d, log=%d, checkpointed=%d.",
+        mode,
+        db_path,
+        busy,
+        log_pages,
+        checkpointed_pages,
+    )
+    _checkpoint_busy_streak = _checkpoint_busy_streak + 1 if busy else 0
+
+
+# Raw files of past months whose final hour has already been aggregated.
+# They can no longer produce new hourly rows, so list_remote_txt_files()
+# drops them before anything else is done with the listing.
+_FULLY_PROCESSED: Set[str] = set()
+
+
+def refresh_fully_processed(db_path: str) -> None:
+    """Rebuild the set of raw files that are completely processed.
+
+    A file counts as complete once its ``last_avg_timestamp`` is the
+    last hour (23:00) of the month in its name. The current month's
+    file can never satisfy this, so it keeps being polled, as do files
+    whose data stopped early and might still be backfilled.
+    """
+    with _DB_LOCK:
+        rows = _get_conn(db_path).execute(
+            "SELECT filename, last_avg_timestamp FROM processing_status "
+            "WHERE last_row > 0"
+        ).fetchall()
+
+    fully_processed = set()
+    for filename, last_avg_timestamp in rows:
+        file_month = parse_file_month(filename)
+        if file_month is None:
+            continue
+        year, month = int(file_month[0]), int(file_month[1])
+        if not 1 <= month <= 12:
+            continue
+        last_day = calendar.monthrange(year, month)[1]
+        final_hour = f"{year:04d}{month:02d}{last_day:02d}T2300+0400"
+        if last_avg_timestamp == final_hour:
+            fully_processed.add(filename)
+
+    _FULLY_PROCESSED.clear()
+    _FULLY_PROCESSED.update(fully_processed)
+    LOGGER.info(
+        "%d raw file(s) are fully processed and will not be polled.",
+        len(fully_processed),
+    )
+
+
+# (last_raw_timestamp, last_avg_timestamp, last_row, last_byte,
+# last_modify) as stored in processing_status.
+ProcessingStatus = Tuple[Optional[str], Optional[str], int, int, Optional[str]]
+
+# Status statements are fixed strings so the driver's prepared-statement
+# cache serves every call after the first.
+_SELECT_STATUS_SQL = (
+    "SELECT last_raw_timestamp, last_avg_timestamp, last_row, last_byte, "
+    "last_modify FROM processing_status WHERE filename = ?"
+)
+_SELECT_ALL_STATUS_SQL = (
+    "SELECT filename, last_raw_timestamp, last_avg_timestamp, last_row, "
+    "last_byte, last_modify FROM processing_status"
+)
+_UPSERT_STATUS_SQL = """
+INSERT INTO processing_status (
+    filename,
+    last_raw_timestamp,
+    last_avg_timestamp,
+    last_row,
+    last_byte,
+    last_modify
+)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (filename) DO UPDATE SET
+    last_raw_timestamp = COALESCE(
+        ?, processing_status.last_raw_timestamp
+    ),
+    last_avg_timestamp = COALESCE(
+        ?, processing_status.last_avg_timestamp
+    ),
+    last_row = COALESCE(?, processing_status.last_row),
+    last_byte = COALESCE(?, processing_status.last_byte),
+    last_modify = COALESCE(?, processing_status.last_modify)
+"""
 
 
 def get_processing_status_for_file(
     db_path: str,
     filename: str,
-) -> Tuple[Optional[str], Optional[str], int]:
-    """Return (last_raw_timestamp, last_avg_timestamp, last_row) for a file.
+) -> ProcessingStatus:
+    """Return the stored processing status for *filename*.
 
-    If there is no entry for *filename*, (None, None, 0) is returned.
+    The result is (last_raw_timestamp, last_avg_timestamp, last_row,
+    last_byte, last_modify). If there is no entry for *filename*,
+    (None, None, 0, 0, None) is returned.
     """
-    connection = sqlite3.connect(db_path)
-    try:
-        cursor = connection.cursor()
-        cursor.execute(
-            "SELECT last_raw_timestamp, last_avg_timestamp, last_row "
-            "FROM processing_status WHERE filename = ?",
-            (filename,),
-        )
+    with _DB_LOCK:
+        cursor = _get_conn(db_path).execute(_SELECT_STATUS_SQL, (filename,))
         result = cursor.fetchone()
-    finally:
-        connection.close()
 
     if result is None:
-        return None, None, 0
+        return None, None, 0, 0, None
+
+    (
+        last_raw_timestamp,
+        last_avg_timestamp,
+        last_row,
+        last_byte,
+        last_modify,
+    ) = result
+    return (
+        last_raw_timestamp,
+        last_avg_timestamp,
+        last_row or 0,
+        last_byte or 0,
+        last_modify,
+    )
+
 
-    last_raw_timestamp, last_avg_timestamp, last_row = result
-    return last_raw_timestamp, last_avg_timestamp, last_row or 0
+def get_all_processing_status(db_path: str) -> Dict[str, ProcessingStatus]:
+    """Return the stored processing status of every file, by filename.
+
+    Reads the whole (one row per month file) table with a single query
+    so a cycle does not need one SELECT per listed file. Values are
+    normalised as in get_processing_status_for_file().
+    """
+    with _DB_LOCK:
+        rows = _get_conn(db_path).execute(_SELECT_ALL_STATUS_SQL).fetchall()
+
+    return {
+        filename: (
+            last_raw_timestamp,
+            last_avg_timestamp,
+            last_row or 0,
+            last_byte or 0,
+            last_modify,
+        )
+        for (
+            filename,
+            last_raw_timestamp,
+            last_avg_timestamp,
+            last_row,
+            last_byte,
+            last_modify,
+        ) in rows
+    }
+
+
+def is_unchanged_since_processed(
+    status: ProcessingStatus,
+    remote_modify: Optional[str],
+    remote_size: Optional[int],
+) -> bool:
+    """Return True if the listed modify/size match the stored *status*.
+
+    Only meaningful when the server reported a modify fact; without one
+    the file always has to be checked.
+    """
+    _, _, _, last_byte, last_modify = status
+    return remote_modify is not None and (remote_modify, remote_size) == (
+        last_modify,
+        last_byte,
+    )
 
 
 def update_processing_status(
@@ -110,65 +415,73 @@ def update_processing_status(
     last_raw_timestamp: Optional[str] = None,
     last_avg_timestamp: Optional[str] = None,
     last_row: Optional[int] = None,
+    last_byte: Optional[int] = None,
+    last_modify: Optional[str] = None,
 ) -> None:
     """Insert or update processing_status row for *filename*.
 
     Only non-None fields are updated on existing rows. For new rows,
-    missing values are stored as empty string or 0.
+    missing values are stored as empty string, 0 or NULL.
+
+    This is a single ``INSERT ... ON CONFLICT DO UPDATE`` statement: the
+    ``COALESCE`` in the update clause keeps the stored value for any
+    field passed as None.
     """
-    connection = sqlite3.connect(db_path)
-    try:
-        cursor = connection.cursor()
-        cursor.execute(
-            "SELECT filename FROM processing_status WHERE filename = ?",
-            (filename,),
+    with _DB_LOCK:
+        _get_conn(db_path).execute(
+            _UPSERT_STATUS_SQL,
+            (
+                filename,
+                last_raw_timestamp or "",
+                last_avg_timestamp or "",
+                last_row or 0,
+                last_byte or 0,
+                last_modify,
+                last_raw_timestamp,
+                last_avg_timestamp,
+                last_row,
+                last_byte,
+                last_modify,
+            ),
         )
-        exists = cursor.fetchone() is not None
-
-        if exists:
-            update_fields: List[str] = []
-            params: List[object] = []
-
-            if last_raw_timestamp is not None:
-                update_fields.append("last_raw_timestamp = ?")
-                params.append(last_raw_timestamp)
-            if last_avg_timestamp is not None:
-                update_fields.append("last_avg_timestamp = ?")
-                params.append(last_avg_timestamp)
-            if last_row is not None:
-                update_fields.append("last_row = ?")
-                params.append(last_row)
-
-            if update_fields:
-                query = (
-                    "UPDATE processing_status SET "
-                    + ", ".join(update_fields)
-                    + " WHERE filename = ?"
-                )
-                params.append(filename)
-                cursor.execute(query, tuple(params))
-        else:
-            cursor.execute(
-                """
-                INSERT INTO processing_status (
-                    filename,
-                    last_raw_timestamp,
-                    last_avg_timestamp,
-                    last_row
-                )
-                VALUES (?, ?, ?, ?)
-                """,
-                (
-                    filename,
-                    last_raw_timestamp or "",
-                    last_avg_timestamp or "",
-                    last_row or 0,
-                ),
+
+
+def get_file_header(db_path: str, filename: str) -> Optional[bytes]:
+    """Return the stored raw header line of *filename*, if any."""
+    with _DB_LOCK:
+        result = (
+            _get_conn(db_path)
+            .execute(
+                "SELECT header FROM processing_status WHERE filename = ?",
+                (filename,),
             )
+            .fetchone()
+        )
+    return None if result is None else result[0]
 
-        connection.commit()
-    finally:
-        connection.close()
+
+def set_file_header(db_path: str, filename: str, header: bytes) -> None:
+    """Store the raw header line of *filename*.
+
+    Creates the processing_status row (with the same defaults as
+    update_processing_status()) if the file has none yet.
+    """
+    with _DB_LOCK:
+        _get_conn(db_path).execute(
+            """
+            INSERT INTO processing_status (
+                filename,
+                last_raw_timestamp,
+                last_avg_timestamp,
+                last_row,
+                last_byte,
+                header
+            )
+            VALUES (?, '', '', 0, 0, ?)
+            ON CONFLICT (filename) DO UPDATE SET header = excluded.header
+            """,
+            (filename, header),
+        )
 
 
 # ---------------------------------------------------------------------------
@@ -218,53 +531,255 @@ def create_ftp_client() -> Optional[FTP]:
         return None
 
 
-def list_remote_txt_files(ftp: FTP) -> List[str]:
+def list_remote_txt_files(
+    ftp: FTP,
+) -> List[Tuple[str, Optional[str], Optional[int]]]:
     """List all ``.txt`` files in the current FTP directory.
 
+    ``MLSD`` is used so each name comes with its modify timestamp and
+    size, which lets unchanged files be skipped without a download.
+    Servers without ``MLSD`` fall back to a plain ``NLST``. Files known
+    to be fully processed are left out.
+
     Args:
         ftp: Active FTP client.
 
     Returns:
-        Sorted list of ``.txt`` filenames.
+        Sorted list of ``(filename, modify, size)`` tuples for the
+        ``.txt`` files; *modify* and *size* are ``None`` when the server
+        did not report them.
     """
     try:
-        names = ftp.nlst()
+        entries = [
+            (name, facts.get("modify"), facts.get("size"))
+            for name, facts in ftp.mlsd(facts=["type", "modify", "size"])
+            if facts.get("type", "file") == "file"
+        ]
     except FTP_ERRORS as exc:
-        LOGGER.error("Failed to list FTP directory: %s", exc)
-        return []
+        LOGGER.debug("MLSD not available (%s); falling back to NLST.", exc)
+        try:
+            entries = [(name, None, None) for name in ftp.nlst()]
+        except FTP_ERRORS as exc:
+            LOGGER.error("Failed to list FTP directory: %s", exc)
+            return []
 
     txt_files = sorted(
-        name for name in names if name.lower().endswith(".txt")
+        (name, modify, int(size) if size and size.isdigit() else None)
+        for name, modify, size in entries
+        if name.lower().endswith(".txt") and name not in _FULLY_PROCESSED
     )
     return txt_files
 
 
+def get_remote_file_size(ftp: FTP, filename: str) -> Optional[int]:
+    """Return the size in bytes of *filename* via FTP ``SIZE``.
+
+    ``None`` is returned if the server does not support ``SIZE`` or
+    refuses it for this file.
+    """
+    try:
+        # SIZE is only well-defined in binary mode.
+        ftp.voidcmd("TYPE I")
+        return ftp.size(filename)
+    except FTP_ERRORS as exc:
+        LOGGER.debug("SIZE not available for '%s': %s", filename, exc)
+        return None
+
+
+# Header line (including its line terminator) of each remote file, kept
+# so a download resumed with REST can be parsed with the right columns.
+# process_file() persists it in processing_status so it survives
+# restarts.
+_HEADER_CACHE: Dict[str, bytes] = {}
+
+# FTP reply codes meaning the server does not implement REST. Once seen,
+# resumed downloads are not attempted again for the life of the process.
+_REST_UNSUPPORTED_CODES = ("500", "501", "502", "504")
+_rest_supported = True
+
+
 def read_remote_file_to_dataframe(
     ftp: FTP,
     filename: str,
-) -> Optional[pd.DataFrame]:
+    skip_rows: int = 0,
+    skip_bytes: int = 0,
+    coerce_sensors: bool = False,
+) -> Optional[Tuple[pd.DataFrame, int, int]]:
     """Retrieve a remote text file over FTP and load it into a DataFrame.
 
     The file is assumed to be a tab-separated text file with headers.
+
+    The download runs in a helper thread that writes into an OS pipe
+    while pandas parses from the other end, so network transfer and
+    parsing overlap and the raw bytes are never held in memory in full.
+
+    If *skip_bytes* is given and the header of *filename* has been seen
+    before, the transfer is resumed at that byte offset with ``REST``
+    and only the tail is downloaded; *skip_bytes* must then be the end
+    of the first *skip_rows* data rows. Otherwise the whole file is
+    downloaded and the first *skip_rows* data rows are skipped by the
+    parser itself. If the file now holds fewer lines than *skip_rows*
+    (e.g. it was replaced), it is parsed from the start.
+
+    Sensor columns are parsed straight to float32. If a cell is not
+    numeric that parse fails, and the file is read again with
+    *coerce_sensors* set: the columns are then parsed untyped and
+    converted with ``pd.to_numeric(errors="coerce")``, so the bad cell
+    becomes NaN instead of blocking the file on every cycle.
+
+    Returns:
+        (dataframe, skipped, end_byte) where *dataframe* holds the
+        complete rows after the first *skipped* data rows and *end_byte*
+        is the offset just past the last complete line read, or
+        ``None`` on failure. A trailing line without a newline is left
+        for the next read.
     """
-    buffer = io.BytesIO()
+    global _rest_supported
+
+    header = _HEADER_CACHE.get(filename) if skip_bytes > 0 else None
+    resume = header is not None and _rest_supported
+
+    read_fd, write_fd = os.pipe()
+    reader = os.fdopen(read_fd, "rb")
+    writer = os.fdopen(write_fd, "wb")
+    newline_count = 0
+    # Bytes passed to the parser: everything up to and including the
+    # last newline received. A trailing partial line (the file is still
+    # being written) is held back in *pending* and never parsed, so the
+    # returned end_byte always falls on a line boundary.
+    line_end_bytes = 0
+    pending = bytearray()
+    header_buffer = bytearray()
+    download_errors: List[BaseException] = []
+
+    def write_chunk(chunk: bytes) -> None:
+        nonlocal newline_count, line_end_bytes
+        newline_count += chunk.count(b"\n")
+        if not resume and b"\n" not in header_buffer:
+            header_buffer.extend(chunk)
+        pending.extend(chunk)
+        line_end = pending.rfind(b"\n") + 1
+        if line_end:
+            writer.write(pending[:line_end])
+            line_end_bytes += line_end
+            del pending[:line_end]
+
+    def download() -> None:
+        try:
+            if resume:
+                writer.write(header)
+                ftp.retrbinary(
+                    f"RETR {filename}",
+                    callback=write_chunk,
+                    rest=skip_bytes,
+                )
+            else:
+                ftp.retrbinary(f"RETR {filename}", callback=write_chunk)
+        except FTP_ERRORS as exc:
+            download_errors.append(exc)
+        finally:
+            writer.close()
+
+    downloader = threading.Thread(
+        target=download,
+        name=f"ftp-retr-{filename}",
+        daemon=True,
+    )
+    downloader.start()
 
+    dataframe: Optional[pd.DataFrame] = None
+    parse_error: Optional[Exception] = None
     try:
-        ftp.retrbinary(f"RETR {filename}", callback=buffer.write)
-    except FTP_ERRORS as exc:
-        LOGGER.error("Error retrieving '%s' over FTP: %s", filename, exc)
+        dataframe = pd.read_table(
+            reader,
+            skiprows=None if resume else range(1, skip_rows + 1),
+            usecols=RAW_COLUMNS.__contains__,
+            dtype=None if coerce_sensors else SENSOR_DTYPES,
+        )
+    except (
+        pd.errors.EmptyDataError,
+        OSError,
+        UnicodeDecodeError,
+        ValueError,
+    ) as exc:
+        parse_error = exc
+    finally:
+        # Drain whatever the parser left unread so the transfer (and the
+        # FTP control connection) completes normally.
+        while reader.read(65536):
+            pass
+        reader.close()
+        downloader.join()
+
+    # A failed transfer also truncates the parser's input, so report the
+    # FTP error in preference to whatever pandas made of a partial file.
+    if download_errors:
+        error = download_errors[0]
+        if resume and str(error)[:3] in _REST_UNSUPPORTED_CODES:
+            LOGGER.warning(
+                "Server rejected REST for '%s' (%s); downloading the "
+                "whole file instead.",
+                filename,
+                error,
+            )
+            _rest_supported = False
+            return read_remote_file_to_dataframe(
+                ftp,
+                filename,
+                skip_rows=skip_rows,
+                coerce_sensors=coerce_sensors,
+            )
+        LOGGER.error("Error retrieving '%s' over FTP: %s", filename, error)
         return None
-
-    buffer.seek(0)
-    try:
-        dataframe = pd.read_table(buffer)
-    except (pd.errors.EmptyDataError, OSError, UnicodeDecodeError) as exc:
-        LOGGER.error("Error parsing '%s' into DataFrame: %s", filename, exc)
+    if dataframe is None:
+        # EmptyDataError and ParserError are ValueErrors too, but
+        # re-reading cannot fix an empty or malformed file.
+        is_dtype_error = isinstance(parse_error, ValueError) and not (
+            isinstance(
+                parse_error,
+                (pd.errors.EmptyDataError, pd.errors.ParserError),
+            )
+        )
+        if is_dtype_error and not coerce_sensors:
+            LOGGER.warning(
+                "Non-numeric sensor value in '%s' (%s); reading it again "
+                "with the bad cells as NaN.",
+                filename,
+                parse_error,
+            )
+            return read_remote_file_to_dataframe(
+                ftp,
+                filename,
+                skip_rows=skip_rows,
+                skip_bytes=skip_bytes,
+                coerce_sensors=True,
+            )
+        LOGGER.error(
+            "Error parsing '%s' into DataFrame: %s", filename, parse_error
+        )
         return None
-    finally:
-        buffer.close()
 
-    return dataframe
+    if coerce_sensors:
+        for column in SENSOR_COLUMNS:
+            if column in dataframe.columns:
+                dataframe[column] = pd.to_numeric(
+                    dataframe[column], errors="coerce"
+                ).astype("float32")
+
+    if resume:
+        return dataframe, skip_rows, skip_bytes + line_end_bytes
+
+    # Header plus N data rows contains at least N newlines.
+    if newline_count < skip_rows:
+        return read_remote_file_to_dataframe(
+            ftp, filename, skip_rows=0, coerce_sensors=coerce_sensors
+        )
+
+    if b"\n" in header_buffer:
+        _HEADER_CACHE[filename] = bytes(
+            header_buffer[: header_buffer.index(b"\n") + 1]
+        )
+    return dataframe, skip_rows, line_end_bytes
 
 
 # ---------------------------------------------------------------------------
@@ -272,6 +787,29 @@ def read_remote_file_to_dataframe(
 # ---------------------------------------------------------------------------
 
 
+# Digits in the third and fourth "_"-separated fields of the base name,
+# the fourth optionally followed by an extension.
+_FILE_MONTH_RE = re.compile(r"^[^_]*_[^_]*_(\d+)_(\d+)(?:\.[^_]*)?(?:_|$)")
+
+# Output name for each raw file name that matched _FILE_MONTH_RE. The
+# timestamp fallback is never cached since it changes on every call.
+_OUTPUT_NAME_CACHE: Dict[str, str] = {}
+
+
+def parse_file_month(filename: str) -> Optional[Tuple[str, str]]:
+    """Return the (year, month) strings from a raw FIDAS file name.
+
+    Raw files are expected to follow
+    ``DUSTMONITOR_17712_<year>_<month>.txt``; ``None`` is returned for
+    names that do not.
+    """
+    match = _FILE_MONTH_RE.match(os.path.basename(filename))
+    if match is None:
+        return None
+    year, month = match.groups()
+    return year, month
+
+
 def build_output_filename(filename: str, now: datetime.datetime) -> str:
     """Construct the monthly CSV filename for a given raw file name.
 
@@ -281,31 +819,181 @@ def build_output_filename(filename: str, now: datetime.datetime) -> str:
     If this pattern cannot be parsed, a timestamp-based fallback name
     is used.
     """
-    base_name = os.path.basename(filename)
-    parts = base_name.split("_")
+    output_filename = _OUTPUT_NAME_CACHE.get(filename)
+    if output_filename is not None:
+        return output_filename
 
-    if len(parts) >= 4:
-        year = parts[2]
-        month_and_ext = parts[3]
-        month, *_ = month_and_ext.split(".")
-        if year.isdigit() and month.isdigit():
-            return f"NYUAD_FIDAS_DATA_{year}_{month}.csv"
+    file_month = parse_file_month(filename)
+    if file_month is not None:
+        year, month = file_month
+        output_filename = f"NYUAD_FIDAS_DATA_{year}_{month}.csv"
+        _OUTPUT_NAME_CACHE[filename] = output_filename
+        return output_filename
 
     formatted_datetime = now.strftime("%Y%m%d_%H%M%S")
     return f"NYUAD_FIDAS_DATA_{formatted_datetime}.csv"
 
 
+# Append-mode handles for the monthly CSVs, kept open across cycles so
+# each batch of hourly rows is a plain buffered write. Only the most
+# recently used few stay open; older months are closed. _CSV_LOCK keeps
+# one worker from evicting a handle another is writing to.
+_CSV_HANDLES: Dict[str, TextIO] = {}
+_MAX_CSV_HANDLES = 4
+_CSV_LOCK = threading.Lock()
+
+
+def _close_csv_handles() -> None:
+    """Close every cached CSV handle (registered with atexit)."""
+    with _CSV_LOCK:
+        while _CSV_HANDLES:
+            _, handle = _CSV_HANDLES.popitem()
+            handle.close()
+
+
+atexit.register(_close_csv_handles)
+
+
+def _get_csv_handle(output_file: str) -> TextIO:
+    """Return a cached append-mode handle for *output_file*."""
+    handle = _CSV_HANDLES.pop(output_file, None)
+    if handle is None or handle.closed:
+        handle = open(
+            output_file,
+            "a",
+            buffering=1 << 16,
+            newline="",
+            encoding="utf-8",
+        )
+        while len(_CSV_HANDLES) >= _MAX_CSV_HANDLES:
+            oldest = next(iter(_CSV_HANDLES))
+            _CSV_HANDLES.pop(oldest).close()
+    # Re-inserting keeps the dict ordered from least to most recently used.
+    _CSV_HANDLES[output_file] = handle
+    return handle
+
+
+def _format_csv_value(value: float) -> str:
+    """Format one mean the way ``DataFrame.to_csv`` does by default.
+
+    Sensor values are parsed as float32, so the mean is printed at that
+    precision: a raw ``10.022`` is written as ``10.022``, not as the
+    float64 expansion of its float32 value (``10.022000312805176``).
+    """
+    return "" if value != value else str(np.float32(value))
+
+
+def format_csv_rows(datetimes: List[str], means: np.ndarray) -> List[str]:
+    """Format hourly means as CSV lines in CSV_COLUMNS order.
+
+    Args:
+        datetimes: The ``datetime`` field of each row.
+        means: One row of SENSOR_COLUMNS means per entry of *datetimes*.
+
+    Returns:
+        The lines, each ending in a newline, without the header.
+    """
+    return [
+        f"{timestamp},{STATION_FIELDS},"
+        + ",".join([_format_csv_value(value) for value in row])
+        + "\n"
+        for timestamp, row in zip(datetimes, means.tolist())
+    ]
+
+
+def append_csv_rows(output_file: str, csv_rows: List[str]) -> None:
+    """Append *csv_rows* to *output_file*, writing the header if new.
+
+    The handle is flushed (not closed) after each batch.
+    """
+    with _CSV_LOCK:
+        handle = _get_csv_handle(output_file)
+        if handle.tell() == 0:
+            handle.write(CSV_HEADER)
+        handle.writelines(csv_rows)
+        handle.flush()
+
+
+def _parse_distinct(values: pd.Series, date_format: str) -> pd.DatetimeIndex:
+    """Parse *values* with *date_format*, once per distinct string.
+
+    pandas' own ``cache=True`` decides from the first few hundred
+    values whether caching pays off; in a FIDAS file those are all
+    distinct minutes, so it never kicks in. Factorising first makes
+    strptime run exactly once per distinct value.
+    """
+    codes, distinct = pd.factorize(values, use_na_sentinel=False)
+    return pd.to_datetime(distinct, format=date_format)[codes]
+
+
+def parse_fidas_datetimes(dates: pd.Series, times: pd.Series) -> pd.Series:
+    """Combine FIDAS ``date`` and ``time`` columns into timestamps.
+
+    The two columns are parsed separately rather than as one joined
+    string: a monthly file holds only ~31 distinct dates and at most
+    1440 distinct times of day, so each distinct string goes through
+    strptime once and the rest is datetime arithmetic.
+
+    Args:
+        dates: Dates formatted as ``%m/%d/%Y``.
+        times: Times of day formatted as ``%I:%M:%S %p``.
+
+    Returns:
+        The combined datetimes, aligned with ``dates``.
+
+    Raises:
+        ValueError: If a value does not match the expected format.
+    """
+    days = _parse_distinct(dates, "%m/%d/%Y")
+    clock = _parse_distinct(times, "%I:%M:%S %p")
+    return pd.Series(days + (clock - clock.normalize()), index=dates.index)
+
+
+def hourly_means(
+    hours: np.ndarray,
+    values: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Average the rows of *values* that share the same *hours* entry.
+
+    Rows are sorted by hour (a no-op pass for chronological input) and
+    each run of equal hours is reduced with one ``np.add.reduceat`` over
+    a C-contiguous float64 array, so float32 input is still summed in
+    double precision. NaN cells are left out of both the
+    sum and the count, matching pandas' ``groupby().mean()``.
+
+    Returns:
+        (unique_hours, means) with one row of *means* per unique hour.
+    """
+    order = np.argsort(hours, kind="stable")
+    hours = hours[order]
+    values = np.ascontiguousarray(values[order], dtype=np.float64)
+
+    unique_hours, starts = np.unique(hours, return_index=True)
+    valid = ~np.isnan(values)
+    sums = np.add.reduceat(np.where(valid, values, 0.0), starts, axis=0)
+    counts = np.add.reduceat(valid.astype(np.int64), starts, axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = sums / counts
+    return unique_hours, means
+
+
 def process_file(
     ftp: FTP,
     output_path: str,
     filename: str,
     output_filename: str,
     db_path: str,
-) -> Tuple[Optional[pd.DataFrame], Optional[str]]:
+    remote_modify: Optional[str] = None,
+    remote_size: Optional[int] = None,
+    status: Optional[ProcessingStatus] = None,
+) -> Tuple[Optional[List[str]], Optional[str]]:
     """Process a single remote FIDAS file and append hourly means to CSV.
 
     The function:
 
+    - Skips *filename* without downloading it if the directory listing
+      reports the same *remote_modify* and *remote_size* as when it was
+      last processed.
     - Retrieves *filename* from the FTP server.
     - Uses the processing_status table to determine how many rows were
       already processed for this file.
@@ -314,37 +1002,90 @@ def process_file(
       *output_path*.
     - Updates processing_status for the file.
 
+    *status* is the file's processing_status entry if the caller has
+    already read it (see get_all_processing_status()); otherwise it is
+    looked up here.
+
     Returns:
-        (dataframe, csv_filename) where *dataframe* contains only the
-        newly processed hourly rows. If there is nothing new to send,
-        both are None.
+        (csv_rows, csv_filename) where *csv_rows* are the CSV lines of
+        the newly processed hourly rows, without the header. If there
+        is nothing new to send, both are None.
     """
+    if status is None:
+        status = get_processing_status_for_file(db_path, filename)
     (
         last_raw_timestamp,
         last_avg_timestamp,
         last_row,
-    ) = get_processing_status_for_file(db_path, filename)
+        last_byte,
+        last_modify,
+    ) = status
+
+    if is_unchanged_since_processed(status, remote_modify, remote_size):
+        LOGGER.info("No new raw data in '%s'.", filename)
+        return None, None
 
     LOGGER.debug(
-        "Processing '%s' (last_raw=%s, last_avg=%s, last_row=%d).",
+        "Processing '%s' (last_raw=%s, last_avg=%s, last_row=%d, "
+        "last_byte=%d).",
         filename,
         last_raw_timestamp,
         last_avg_timestamp,
         last_row,
+        last_byte,
     )
 
-    dataframe = read_remote_file_to_dataframe(ftp, filename)
-    if dataframe is None:
+    # Only resume from last_byte when the size confirms the file has
+    # grown past it; an unchanged size means there is nothing to
+    # download. The MLSD listing usually has the size already, so SIZE
+    # is only sent when it does not.
+    if remote_size is None:
+        remote_size = get_remote_file_size(ftp, filename)
+    if remote_size is not None and 0 < last_byte == remote_size:
+        LOGGER.info("No new raw data in '%s'.", filename)
+        # Record the listed modify time too, or the stored pair mixes
+        # an old modify with this size and never matches the listing.
+        update_processing_status(db_path, filename, last_modify=remote_modify)
+        return None, None
+    if remote_size is None or remote_size < last_byte or last_row == 0:
+        last_byte = 0
+
+    # After a restart the header is only known from the database;
+    # without it the resume below would fall back to a full download.
+    if last_byte > 0 and filename not in _HEADER_CACHE:
+        stored_header = get_file_header(db_path, filename)
+        if stored_header:
+            _HEADER_CACHE[filename] = stored_header
+    known_header = _HEADER_CACHE.get(filename)
+
+    result = read_remote_file_to_dataframe(
+        ftp,
+        filename,
+        skip_rows=last_row,
+        skip_bytes=last_byte,
+    )
+    if result is None:
         # Error already logged in read_remote_file_to_dataframe.
         return None, None
 
-    total_rows = len(dataframe)
+    header = _HEADER_CACHE.get(filename)
+    if header is not None and header != known_header:
+        set_file_header(db_path, filename, header)
+
+    df_new, skipped_rows, end_byte = result
+    total_rows = skipped_rows + len(df_new)
     if total_rows == 0:
         LOGGER.info("File '%s' is empty.", filename)
-        update_processing_status(db_path, filename, last_row=0)
+        update_processing_status(
+            db_path,
+            filename,
+            last_row=0,
+            last_byte=end_byte,
+            last_modify=remote_modify,
+        )
         return None, None
 
-    if last_row > total_rows:
+    if skipped_rows < last_row:
         LOGGER.warning(
             "Stored last_row (%d) is greater than total_rows (%d) "
             "for '%s'. Resetting last_row to 0.",
@@ -356,14 +1097,17 @@ def process_file(
 
     if total_rows == last_row:
         LOGGER.info("No new raw data in '%s'.", filename)
+        update_processing_status(
+            db_path,
+            filename,
+            last_byte=end_byte,
+            last_modify=remote_modify,
+        )
         return None, None
 
-    df_new = dataframe.iloc[last_row:].copy()
-
     try:
-        df_new.loc[:, "date_time"] = pd.to_datetime(
-            df_new.loc[:, "date"] + " " + df_new.loc[:, "time"],
-            format="%m/%d/%Y %I:%M:%S %p",
+        df_new.loc[:, "date_time"] = parse_fidas_datetimes(
+            df_new.loc[:, "date"], df_new.loc[:, "time"]
         )
     except KeyError as exc:
         LOGGER.error(
@@ -376,74 +1120,87 @@ def process_file(
         LOGGER.error("Error parsing date/time in '%s': %s", filename, exc)
         return None, None
 
-    df_new.loc[:, "hour"] = df_new.loc[:, "date_time"].dt.floor("h")
-    current_hour = pd.Timestamp.now().floor("h")
+    current_hour = np.datetime64(datetime.datetime.now(), "h")
+
+    # With resumed reads most cycles only bring rows of the still-open
+    # hour; spot that before doing any per-row hour work.
+    earliest = df_new.loc[:, "date_time"].min()
+    if pd.isna(earliest) or earliest >= current_hour:
+        LOGGER.info("No new completed hours to process in '%s'.", filename)
+        update_processing_status(
+            db_path,
+            filename,
+            last_row=total_rows,
+            last_byte=end_byte,
+            last_modify=remote_modify,
+        )
+        return None, None
+
+    # Casting to datetime64[h] floors each timestamp to its hour in
+    # numpy; casting back keeps the column's own resolution.
+    date_times = df_new.loc[:, "date_time"].to_numpy()
+    row_hours = date_times.astype("datetime64[h]").astype(date_times.dtype)
+
+    is_new_complete_hour = row_hours < current_hour
+    # Hours up to last_avg_timestamp have been sent already; dropping
+    # them keeps a lagging or reset last_row from sending duplicates.
+    if last_avg_timestamp:
+        try:
+            last_avg_hour = np.datetime64(
+                datetime.datetime.strptime(
+                    last_avg_timestamp[:-5], "%Y%m%dT%H%M"
+                ),
+                "h",
+            )
+        except ValueError:
+            LOGGER.warning(
+                "Ignoring unparsable last_avg_timestamp %r for '%s'.",
+                last_avg_timestamp,
+                filename,
+            )
+        else:
+            is_new_complete_hour &= row_hours > last_avg_hour
 
-    complete_data = df_new[df_new.loc[:, "hour"] < current_hour]
+    complete_data = df_new[is_new_complete_hour]
     if complete_data.empty:
         LOGGER.info("No new completed hours to process in '%s'.", filename)
-        update_processing_status(db_path, filename, last_row=total_rows)
+        update_processing_status(
+            db_path,
+            filename,
+            last_row=total_rows,
+            last_byte=end_byte,
+            last_modify=remote_modify,
+        )
         return None, None
 
     try:
-        grouped = complete_data.groupby("hour").agg(
-            {
-                "wind speed": "mean",
-                "wind direction": "mean",
-                "T": "mean",
-                "rH": "mean",
-                "p": "mean",
-                "PM1": "mean",
-                "PM2.5": "mean",
-                "PM10": "mean",
-            }
-        )
+        sensor_data = complete_data.loc[:, SENSOR_COLUMNS]
     except KeyError as exc:
         LOGGER.error(
             "Missing expected column while aggregating '%s': %s", filename, exc
         )
         return None, None
 
-    grouped = grouped.reset_index()
-    grouped.loc[:, "datetime"] = (
-        grouped.loc[:, "hour"].dt.strftime("%Y%m%dT%H%M") + "+0400"
-    )
-
-    csv_data = pd.DataFrame(
-        {
-            "datetime": grouped.loc[:, "datetime"],
-            "name": "Fidas Station (ACCESS)",
-            "lat": 24.5254,
-            "lon": 54.4319,
-            "WV": grouped.loc[:, "wind speed"],
-            "WD": grouped.loc[:, "wind direction"],
-            "TEMP": grouped.loc[:, "T"],
-            "HUMI": grouped.loc[:, "rH"],
-            "PRES": grouped.loc[:, "p"],
-            "PM01": grouped.loc[:, "PM1"],
-            "PM25": grouped.loc[:, "PM2.5"],
-            "PM10": grouped.loc[:, "PM10"],
-        }
+    hours, means = hourly_means(
+        row_hours[is_new_complete_hour],
+        sensor_data.to_numpy(),
     )
+    datetimes = [
+        f"{hour}+0400"
+        for hour in pd.DatetimeIndex(hours).strftime("%Y%m%dT%H%M")
+    ]
+    csv_rows = format_csv_rows(datetimes, means)
 
     os.makedirs(output_path, exist_ok=True)
     output_file = os.path.join(output_path, output_filename)
 
     try:
-        if os.path.exists(output_file):
-            csv_data.to_csv(
-                output_file,
-                mode="a",
-                header=False,
-                index=False,
-            )
-        else:
-            csv_data.to_csv(output_file, index=False)
+        append_csv_rows(output_file, csv_rows)
     except OSError as exc:
         LOGGER.error("Error writing CSV '%s': %s", output_file, exc)
         return None, None
 
-    new_last_avg = grouped.loc[:, "datetime"].iloc[-1]
+    new_last_avg = datetimes[-1]
     new_last_raw = (
         complete_data.loc[:, "date_time"]
         .max()
@@ -458,6 +1215,8 @@ def process_file(
         last_raw_timestamp=new_last_raw,
         last_avg_timestamp=new_last_avg,
         last_row=total_rows,
+        last_byte=end_byte,
+        last_modify=remote_modify,
     )
 
     LOGGER.info(
@@ -465,7 +1224,7 @@ def process_file(
         output_filename,
         filename,
     )
-    return csv_data, output_filename
+    return csv_rows, output_filename
 
 
 # ---------------------------------------------------------------------------
@@ -473,65 +1232,91 @@ def process_file(
 # ---------------------------------------------------------------------------
 
 
+def create_http_session() -> requests.Session:
+    """Create the keep-alive session used for all IQAir uploads.
+
+    The session reuses TCP/TLS connections between uploads and retries
+    POSTs that fail to connect or get a 502/503, i.e. cases where the
+    upload most likely never reached the API. Read errors and 504s are
+    not retried: the body has been sent by then and IQAir may already
+    have stored it, so re-sending would duplicate the hourly rows.
+    """
+    retry = Retry(
+        total=3,
+        read=0,
+        backoff_factor=0.5,
+        status_forcelist=[502, 503],
+        allowed_methods=frozenset({"POST"}),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update(HEADERS)
+    return session
+
+
+_SESSION = create_http_session()
+atexit.register(_SESSION.close)
+
+
 def send_csv_data(
-    dataframe: pd.DataFrame,
+    csv_rows: List[str],
     output_filename: str,
 ) -> Optional[dict]:
-    """Send a CSV DataFrame to the IQAir OpenAir API.
+    """Send CSV rows to the IQAir OpenAir API.
 
     Args:
-        dataframe: DataFrame containing hourly-aggregated rows.
+        csv_rows: Hourly-aggregated CSV lines, as from format_csv_rows().
         output_filename: Name used for the uploaded CSV file.
 
     Returns:
         Parsed JSON response from the API on success, or ``None`` on failure.
     """
-    buffer = io.StringIO()
+    # The rows are the ones already appended to the monthly CSV; encode
+    # once up front and requests sends these bytes as-is.
+    payload = (CSV_HEADER + "".join(csv_rows)).encode("utf-8")
+    files = {
+        "file": (output_filename, payload, "text/csv"),
+    }
+
     try:
-        dataframe.to_csv(buffer, index=False)
-        buffer.seek(0)
+        response = _SESSION.post(
+            API_URL,
+            files=files,
+            timeout=(5, 30),
+        )
+    except requests.RequestException as exc:
+        LOGGER.error("Network error sending CSV to API: %s", exc)
+        return None
 
-        files = {
-            "file": (output_filename, buffer, "text/csv"),
-        }
+    LOGGER.info(
+        "API response status for '%s': %s",
+        output_filename,
+        response.status_code,
+    )
+    LOGGER.debug("API response text: %s", response.text)
 
-        try:
-            response = requests.post(
-                API_URL,
-                headers=HEADERS,
-                files=files,
-                timeout=30,
-            )
-        except requests.RequestException as exc:
-            LOGGER.error("Network error sending CSV to API: %s", exc)
-            return None
+    try:
+        response.raise_for_status()
+    except requests.HTTPError as exc:
+        LOGGER.error("API returned error for '%s': %s", output_filename, exc)
+        return None
 
-        LOGGER.info(
-            "API response status for '%s': %s",
+    try:
+        return response.json()
+    except ValueError:
+        LOGGER.error(
+            "Failed to decode JSON response for '%s'. Raw text: %s",
             output_filename,
-            response.status_code,
+            response.text,
         )
-        LOGGER.debug("API response text: %s", response.text)
-
-        try:
-            response.raise_for_status()
-        except requests.HTTPError as exc:
-            LOGGER.error(
-                "API returned error for '%s': %s", output_filename, exc
-            )
-            return None
-
-        try:
-            return response.json()
-        except ValueError:
-            LOGGER.error(
-                "Failed to decode JSON response for '%s'. Raw text: %s",
-                output_filename,
-                response.text,
-            )
-            return None
-    finally:
-        buffer.close()
+        return None
 
 
 # ---------------------------------------------------------------------------
@@ -539,30 +1324,144 @@ def send_csv_data(
 # ---------------------------------------------------------------------------
 
 
-def sleep_until_next_run(interval_seconds: int = 60) -> None:
-    """Sleep until the next scheduled run.
+# Remote files are processed concurrently, each worker on its own FTP
+# connection, so slow transfers overlap across files.
+MAX_WORKERS = 4
+
+# Uploads run on their own threads so a worker can start on the next
+# file while the previous file's POST is still waiting on the network.
+UPLOAD_WORKERS = 4
+
+# Seconds between the starts of consecutive cycles.
+CYCLE_INTERVAL_SECONDS = 60
+
+# Run maintain_database() every this many cycles (~hourly).
+MAINTENANCE_INTERVAL_CYCLES = 60
 
-    The next run is simply ``now + interval_seconds``. This keeps the
-    loop readable and close to the original behaviour (check roughly
-    every minute).
+
+def sleep_until_next_run(
+    deadline: float,
+    interval_seconds: int = CYCLE_INTERVAL_SECONDS,
+) -> float:
+    """Sleep until *deadline* and return the deadline actually used.
+
+    *deadline* is a ``time.monotonic()`` value, so the schedule keeps a
+    fixed rate regardless of how long a cycle took and is immune to
+    wall-clock jumps (NTP, DST). If the cycle overran its deadline, the
+    schedule is re-anchored ``interval_seconds`` from now rather than
+    firing back-to-back catch-up runs.
     """
-    now = datetime.datetime.now()
-    next_run = now + datetime.timedelta(seconds=interval_seconds)
-    sleep_seconds = max(0, int((next_run - now).total_seconds()))
+    remaining = deadline - time.monotonic()
+    if remaining < 0:
+        LOGGER.warning(
+            "Cycle overran its schedule by %.1f seconds; next check in "
+            "%d seconds.",
+            -remaining,
+            interval_seconds,
+        )
+        remaining = float(interval_seconds)
+        deadline = time.monotonic() + remaining
 
+    next_run = datetime.datetime.now() + datetime.timedelta(seconds=remaining)
     LOGGER.info(
         "Sleeping for %d seconds until next check at %s.",
-        sleep_seconds,
+        round(remaining),
         next_run.isoformat(timespec="seconds"),
     )
-    time.sleep(sleep_seconds)
+    time.sleep(remaining)
+    return deadline
+
+
+def close_ftp_client(ftp: FTP) -> None:
+    """Quit *ftp*, falling back to close() if the server hung up."""
+    try:
+        ftp.quit()
+    except FTP_ERRORS:
+        # Some servers may close the connection early; ignore.
+        try:
+            ftp.close()
+        except FTP_ERRORS:
+            pass
+
+
+def upload_hourly_data(
+    filename: str,
+    csv_rows: List[str],
+    output_filename: str,
+) -> None:
+    """Send the new hourly rows of *filename* to IQAir and log the result."""
+    api_response = send_csv_data(
+        csv_rows=csv_rows,
+        output_filename=output_filename,
+    )
+    LOGGER.info(
+        "CSV sent to IQAir API for '%s'. API response: %s",
+        filename,
+        api_response,
+    )
+
+
+def process_and_send(
+    ftp_pool: "queue.Queue[FTP]",
+    statuses: Dict[str, ProcessingStatus],
+    upload_executor: ThreadPoolExecutor,
+    remote_file: Tuple[str, Optional[str], Optional[int]],
+) -> Optional[Future]:
+    """Process one listed remote file and queue upload of its new rows.
+
+    *remote_file* is a ``(filename, modify, size)`` entry from
+    list_remote_txt_files() and *statuses* the cycle's snapshot from
+    get_all_processing_status(). The FTP client is checked out of
+    *ftp_pool* only for the download and processing step.
+
+    Returns:
+        The future of the upload submitted to *upload_executor*, or
+        ``None`` if there was nothing to send.
+    """
+    filename, remote_modify, remote_size = remote_file
+    now = datetime.datetime.now()
+    output_filename = build_output_filename(filename, now)
+
+    ftp = ftp_pool.get()
+    try:
+        csv_rows, final_output_filename = process_file(
+            ftp=ftp,
+            output_path=CSV_PATH,
+            filename=filename,
+            output_filename=output_filename,
+            db_path=DB_PATH,
+            remote_modify=remote_modify,
+            remote_size=remote_size,
+            status=statuses.get(filename, (None, None, 0, 0, None)),
+        )
+    finally:
+        ftp_pool.put(ftp)
+
+    if csv_rows is None:
+        LOGGER.info("No new hourly data to send from '%s'.", filename)
+        return None
+    return upload_executor.submit(
+        upload_hourly_data,
+        filename,
+        csv_rows,
+        final_output_filename or output_filename,
+    )
 
 
 def main() -> None:
     """Entry point for the FIDAS → IQAir upload loop."""
     setup_database(DB_PATH)
+    refresh_fully_processed(DB_PATH)
+    cycle = 0
+    next_run = time.monotonic()
+    upload_executor = ThreadPoolExecutor(
+        max_workers=UPLOAD_WORKERS,
+        thread_name_prefix="iqair-upload",
+    )
 
     while True:
+        cycle += 1
+        next_run += CYCLE_INTERVAL_SECONDS
         ftp = create_ftp_client()
         if ftp is None:
             LOGGER.error(
@@ -570,6 +1469,8 @@ def main() -> None:
                 "will retry after the sleep interval.",
             )
         else:
+            ftp_clients = [ftp]
+            uploads: List[Optional[Future]] = []
             try:
                 txt_files = list_remote_txt_files(ftp)
                 if not txt_files:
@@ -578,47 +1479,63 @@ def main() -> None:
                         FTP_HOME_DIR or "<current>",
                     )
 
-                for filename in txt_files:
-                    now = datetime.datetime.now()
-                    output_filename = build_output_filename(filename, now)
-
-                    csv_data, final_output_filename = process_file(
-                        ftp=ftp,
-                        output_path=CSV_PATH,
-                        filename=filename,
-                        output_filename=output_filename,
-                        db_path=DB_PATH,
-                    )
-
-                    if csv_data is not None:
-                        api_response = send_csv_data(
-                            dataframe=csv_data,
-                            output_filename=(
-                                final_output_filename or output_filename
-                            ),
-                        )
-                        LOGGER.info(
-                            "CSV sent to IQAir API for '%s'. API response: %s",
-                            filename,
-                            api_response,
-                        )
+                # One status query per cycle; files whose listing
+                # matches what was last processed need no worker.
+                statuses = get_all_processing_status(DB_PATH)
+                pending_files = []
+                for remote_file in txt_files:
+                    filename, remote_modify, remote_size = remote_file
+                    status = statuses.get(filename)
+                    if status is not None and is_unchanged_since_processed(
+                        status, remote_modify, remote_size
+                    ):
+                        LOGGER.info("No new raw data in '%s'.", filename)
                     else:
-                        LOGGER.info(
-                            "No new hourly data to send from '%s'.",
-                            filename,
+                        pending_files.append(remote_file)
+
+                # One FTP connection per worker; if the server refuses
+                # extra logins, carry on with the ones we have.
+                while len(ftp_clients) < min(MAX_WORKERS, len(pending_files)):
+                    extra_ftp = create_ftp_client()
+                    if extra_ftp is None:
+                        break
+                    ftp_clients.append(extra_ftp)
+
+                ftp_pool: "queue.Queue[FTP]" = queue.Queue()
+                for client in ftp_clients:
+                    ftp_pool.put(client)
+
+                with ThreadPoolExecutor(
+                    max_workers=len(ftp_clients),
+                    thread_name_prefix="fidas-file",
+                ) as executor:
+                    # list() re-raises any worker exception here.
+                    uploads = list(
+                        executor.map(
+                            functools.partial(
+                                process_and_send,
+                                ftp_pool,
+                                statuses,
+                                upload_executor,
+                            ),
+                            pending_files,
                         )
+                    )
             finally:
-                try:
-                    ftp.quit()
-                except FTP_ERRORS:
-                    # Some servers may close the connection early; ignore.
-                    try:
-                        ftp.close()
-                    except FTP_ERRORS:
-                        pass
-
-        # ~every minute; keep aligned with your previous behaviour.
-        sleep_until_next_run(interval_seconds=60)
+                for client in ftp_clients:
+                    close_ftp_client(client)
+
+            # Every upload of this cycle finishes before the next one
+            # can process the same files again.
+            for upload in uploads:
+                if upload is not None:
+                    upload.result()
+
+        if cycle % MAINTENANCE_INTERVAL_CYCLES == 0:
+            maintain_database(DB_PATH)
+            refresh_fully_processed(DB_PATH)
+
+        next_run = sleep_until_next_run(next_run)
 
 
 if __name__ == "__main__":